@@ -1,26 +1,37 @@
-import secrets
+import binascii
 import os
 
-def generate_jwt_secrets(local_secret_path="local_jwt_secret.txt", deploy_secret_path="deploy_jwt_secret.txt"):
+# Secrets already read from disk, keyed by file path.
+_SECRET_CACHE = {}
+
+def generate_jwt_secrets(local_secret_path="local_jwt_secret.txt", deploy_secret_path="deploy_jwt_secret.txt", overwrite=False):
     """
     Generates two JWT secret keys, one for local development and one for deployment.
-    Stores them in separate files.
+    Stores them in separate files. Existing secret files are kept unless overwrite is True.
 
     Args:
         local_secret_path (str): Path to the file for the local secret.
         deploy_secret_path (str): Path to the file for the deploy secret.
+        overwrite (bool): Regenerate the secrets even if both files already exist.
     """
+    if not overwrite and os.path.exists(local_secret_path) and os.path.exists(deploy_secret_path):
+        print("JWT secret files already exist, skipping generation.")
+        return
 
-    local_secret = secrets.token_hex(32)  # Generates a 32-byte (256-bit) random hex string
-    deploy_secret = secrets.token_hex(32)
+    # Draw both 32-byte (256-bit) secrets from a single urandom call
+    raw = os.urandom(64)
+    local_secret = binascii.hexlify(raw[:32]).decode()
+    deploy_secret = binascii.hexlify(raw[32:]).decode()
 
     try:
         with open(local_secret_path, "w") as f:
             f.write(local_secret)
+        _SECRET_CACHE.pop(local_secret_path, None)
         print(f"Local JWT secret written to: {local_secret_path}")
 
         with open(deploy_secret_path, "w") as f:
             f.write(deploy_secret)
+        _SECRET_CACHE.pop(deploy_secret_path, None)
         print(f"Deployment JWT secret written to: {deploy_secret_path}")
 
     except OSError as e:
@@ -29,6 +40,7 @@ def generate_jwt_secrets(local_secret_path="local_jwt_secret.txt", deploy_secret
 def get_jwt_secret(is_local=True, local_secret_path="local_jwt_secret.txt", deploy_secret_path="deploy_jwt_secret.txt"):
     """
     Retrieves the appropriate JWT secret key based on the environment.
+    The file is only read once; later calls return the cached value.
 
     Args:
         is_local (bool): True for local environment, False for deployment.
@@ -40,9 +52,15 @@ def get_jwt_secret(is_local=True, local_secret_path="local_jwt_secret.txt", depl
     """
     secret_path = local_secret_path if is_local else deploy_secret_path
 
+    secret = _SECRET_CACHE.get(secret_path)
+    if secret is not None:
+        return secret
+
     try:
         with open(secret_path, "r") as f:
-            return f.read().strip()  # Remove any trailing whitespace
+            secret = f.read().strip()  # Remove any trailing whitespace
+        _SECRET_CACHE[secret_path] = secret
+        return secret
     except FileNotFoundError:
         print(f"JWT secret file not found: {secret_path}")
         return None
@@ -50,17 +68,18 @@ def get_jwt_secret(is_local=True, local_secret_path="local_jwt_secret.txt", depl
         print(f"Error reading JWT secret: {e}")
         return None
 
-# Example usage:
-generate_jwt_secrets() #create the files if they do not exist.
+if __name__ == "__main__":
+    # Example usage:
+    generate_jwt_secrets() #create the files if they do not exist.
 
-# Example of retrieving the secret:
-local_secret = get_jwt_secret(is_local=True)
-deploy_secret = get_jwt_secret(is_local=False)
+    # Example of retrieving the secret:
+    local_secret = get_jwt_secret(is_local=True)
+    deploy_secret = get_jwt_secret(is_local=False)
 
-if local_secret:
-    print(f"Local Secret: {local_secret[0:8]}... (first 8 characters)") #print only a small portion.
-if deploy_secret:
-    print(f"Deploy Secret: {deploy_secret[0:8]}... (first 8 characters)") #print only a small portion.
+    if local_secret:
+        print(f"Local Secret: {local_secret[0:8]}... (first 8 characters)") #print only a small portion.
+    if deploy_secret:
+        print(f"Deploy Secret: {deploy_secret[0:8]}... (first 8 characters)") #print only a small portion.
 
 # Example of usage within a flask app.
 # inside of a flask app, the is_local variable could be determined by an environment variable.
@@ -7,8 +7,10 @@ with Vim-like keybindings and customizable keymaps.
 import os
 import re
 import sys
-import glob
+import shutil
 import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -33,77 +35,129 @@ DEFAULT_KEYMAP = {
     "reload": "r",
 }
 
-# Todo item regex pattern
-TODO_PATTERN = r"- \[([ xX])\] (.+?)(?:\s+#(\w+))?\s*$"
+# Parsed keymap cached with the config file's mtime, as (st_mtime_ns, keymap)
+_KEYMAP_CACHE: Optional[Tuple[int, Dict[str, str]]] = None
+
+# Todo item regex pattern, compiled once and matched against each line.
+# The optional trailing #category is split off in Python (see split_category)
+# so the regex stays linear instead of backtracking over every line.
+TODO_RE = re.compile(r"- \[([ xX])\] (.+)$")
+CATEGORY_RE = re.compile(r"\w+")
+
+
+def split_category(text: str) -> Tuple[str, Optional[str]]:
+    """Split an optional trailing ' #category' tag off a todo's text."""
+    text = text.rstrip()
+    head, sep, tag = text.rpartition("#")
+    if sep and head[-1:].isspace() and head.strip() and CATEGORY_RE.fullmatch(tag):
+        return head.rstrip(), tag
+    return text, None
+
+
+def parse_todo_file(file_path: str) -> List[Tuple[bool, str, Optional[str]]]:
+    """Parse (done, text, category) tuples from a markdown todo file."""
+    items = []
+    # Stream the file line by line instead of reading it whole
+    with open(file_path, 'r', encoding='utf-8', buffering=1 << 16) as f:
+        for line in f:
+            match = TODO_RE.match(line)
+            if match:
+                mark, text = match.groups()
+                text, category = split_category(text)
+                items.append((mark.lower() == "x", text, category))
+    return items
+
 
 class TodoItem:
     """Represents a single todo item with text, status, and category."""
+    __slots__ = ('text', 'done', 'category', '_md')
+    
     def __init__(self, text: str, done: bool = False, category: str = ""):
         self.text = text
         self.done = done
         self.category = category or "uncategorized"
+        self._md: Optional[str] = None
     
     def toggle(self):
         """Toggle the done status of the todo item."""
         self.done = not self.done
+        self._md = None
+    
+    def update(self, text: str, category: str = ""):
+        """Update the text and category of the todo item."""
+        self.text = text
+        self.category = category or "uncategorized"
+        self._md = None
     
     def to_markdown(self) -> str:
-        """Convert the todo item to markdown format."""
-        mark = "x" if self.done else " "
-        category_text = f" #{self.category}" if self.category and self.category != "uncategorized" else ""
-        return f"- [{mark}] {self.text}{category_text}"
+        """Convert the todo item to markdown format (cached until changed)."""
+        if self._md is None:
+            mark = "x" if self.done else " "
+            category_text = f" #{self.category}" if self.category and self.category != "uncategorized" else ""
+            self._md = f"- [{mark}] {self.text}{category_text}"
+        return self._md
 
 
 class TodoList:
     """Manages a collection of todo items from markdown files."""
     def __init__(self, directory: str):
         self.directory = os.path.expanduser(directory)
-        self.todo_files = {}
-        self.todos = []
+        # Source file name of each todo, keyed by id(todo) like self.todos
+        self.todo_files: Dict[int, str] = {}
+        # Todos keyed by id() for O(1) membership and deletion; dicts keep
+        # insertion order, so iteration order matches the files.
+        self.todos: Dict[int, TodoItem] = {}
         self.categories = set(["uncategorized"])
+        self._categories_sorted: Optional[List[str]] = None
+        self._by_category: Dict[str, List[TodoItem]] = defaultdict(list)
         self.load_todos()
     
     def load_todos(self):
         """Load todo items from markdown files in the directory."""
-        self.todos = []
+        self.todos = {}
         self.todo_files = {}
+        self._by_category = defaultdict(list)
         
         # Create the directory if it doesn't exist
         todo_dir = os.path.join(self.directory, "todo")
         os.makedirs(todo_dir, exist_ok=True)
         
-        # Find all markdown files in the todo directory
-        md_files = glob.glob(os.path.join(todo_dir, "*.md"))
+        # Find all markdown files in the todo directory. The name checks run
+        # first so is_file() is only called for candidates; hidden files are
+        # skipped just like glob's "*.md" did.
+        with os.scandir(todo_dir) as entries:
+            md_files = [entry for entry in entries
+                        if entry.name.endswith(".md")
+                        and not entry.name.startswith(".")
+                        and entry.is_file()]
         
-        for file_path in md_files:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Extract todo items using regex
-            for line in content.splitlines():
-                match = re.match(TODO_PATTERN, line)
-                if match:
-                    mark, text, category = match.groups()
-                    done = mark.lower() == "x"
+        if not md_files:
+            return
+        
+        # Read and parse the files concurrently, then merge in file order
+        with ThreadPoolExecutor(max_workers=min(8, len(md_files))) as executor:
+            parsed = executor.map(parse_todo_file, [entry.path for entry in md_files])
+            for entry, items in zip(md_files, parsed):
+                # Track which file the todos came from
+                file_name = entry.name
+                for done, text, category in items:
                     category = category or "uncategorized"
-                    self.categories.add(category)
+                    self.add_category(category)
                     todo = TodoItem(text, done, category)
-                    self.todos.append(todo)
-                    
-                    # Track which file this todo came from
-                    file_name = os.path.basename(file_path)
-                    self.todo_files[todo] = file_name
+                    self.todos[id(todo)] = todo
+                    self._by_category[category].append(todo)
+                    self.todo_files[id(todo)] = file_name
     
     def save_todos(self):
         """Save todo items back to markdown files by category."""
         # Group todos by file
         todos_by_file = {}
-        for todo in self.todos:
-            file_name = self.todo_files.get(todo)
+        for todo in self.todos.values():
+            file_name = self.todo_files.get(id(todo))
             if not file_name:
                 # If this is a new todo, assign it to a category file
                 file_name = f"{todo.category}.md"
-                self.todo_files[todo] = file_name
+                self.todo_files[id(todo)] = file_name
             
             if file_name not in todos_by_file:
                 todos_by_file[file_name] = []
@@ -114,70 +168,129 @@ class TodoList:
         for file_name, todos in todos_by_file.items():
             file_path = os.path.join(todo_dir, file_name)
             
-            # Group todos by done status
-            done_todos = [todo for todo in todos if todo.done]
-            not_done_todos = [todo for todo in todos if not todo.done]
+            # Group todos by done status in a single pass
+            done_todos, not_done_todos = [], []
+            append_done, append_not_done = done_todos.append, not_done_todos.append
+            for todo in todos:
+                (append_done if todo.done else append_not_done)(todo)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                # Write header
-                category_name = file_name.replace('.md', '')
-                f.write(f"# {category_name.capitalize()} Tasks\n\n")
-                
-                # Write not done todos first
-                if not_done_todos:
-                    f.write("## Active\n\n")
-                    for todo in not_done_todos:
-                        f.write(f"{todo.to_markdown()}\n")
-                    f.write("\n")
-                
-                # Write done todos
-                if done_todos:
-                    f.write("## Completed\n\n")
-                    for todo in done_todos:
-                        f.write(f"{todo.to_markdown()}\n")
+            # Write header
+            category_name = file_name.replace('.md', '')
+            parts = [f"# {category_name.capitalize()} Tasks\n\n"]
+            append = parts.append
+            
+            # Write not done todos first
+            if not_done_todos:
+                append("## Active\n\n")
+                for todo in not_done_todos:
+                    append(f"{todo.to_markdown()}\n")
+                append("\n")
+            
+            # Write done todos
+            if done_todos:
+                append("## Completed\n\n")
+                for todo in done_todos:
+                    append(f"{todo.to_markdown()}\n")
+            
+            # Write to a temporary file and swap it in so an interrupted
+            # save never leaves a half-written todo file behind. Resolve
+            # symlinks first so the link's target is replaced, not the link,
+            # and keep the existing file's permissions.
+            target_path = os.path.realpath(file_path)
+            tmp_path = f"{target_path}.tmp"
+            data = "".join(parts).encode('utf-8')
+            try:
+                with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                    f.write(data)
+                if os.path.exists(target_path):
+                    shutil.copymode(target_path, tmp_path)
+                os.replace(tmp_path, target_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
             
     def add_todo(self, text: str, category: str = ""):
         """Add a new todo item."""
         category = category or "uncategorized"
-        self.categories.add(category)
+        self.add_category(category)
         todo = TodoItem(text, False, category)
-        self.todos.append(todo)
+        self.todos[id(todo)] = todo
+        self._by_category[category].append(todo)
         return todo
     
+    def update_todo(self, todo, text: str, category: str = ""):
+        """Update a todo's text and category, moving it to the new category."""
+        category = category or "uncategorized"
+        if id(todo) not in self.todos:
+            # The todo went stale (e.g. a reload ran while it was being
+            # edited), so there is no index entry to move
+            todo.update(text, category)
+            return
+        if category != todo.category:
+            self._by_category[todo.category].remove(todo)
+            self._by_category[category].append(todo)
+            self.add_category(category)
+        todo.update(text, category)
+    
     def delete_todo(self, todo):
         """Delete a todo item."""
-        if todo in self.todos:
-            self.todos.remove(todo)
-            if todo in self.todo_files:
-                del self.todo_files[todo]
+        if self.todos.pop(id(todo), None) is not None:
+            self._by_category[todo.category].remove(todo)
+            self.todo_files.pop(id(todo), None)
     
     def get_todos_by_category(self, category: str) -> List[TodoItem]:
         """Get a list of todos filtered by category."""
-        return [todo for todo in self.todos if todo.category == category]
+        return self._by_category.get(category, [])
+    
+    def add_category(self, category: str):
+        """Register a category, invalidating the sorted category cache."""
+        if category not in self.categories:
+            self.categories.add(category)
+            self._categories_sorted = None
     
     def get_categories(self) -> List[str]:
-        """Get a sorted list of all categories."""
-        return sorted(list(self.categories))
+        """Get a sorted list of all categories (cached until one is added)."""
+        if self._categories_sorted is None:
+            self._categories_sorted = sorted(self.categories)
+        return self._categories_sorted
 
 
 class TodoApp:
     """TUI application for managing todos with vim-like keybindings."""
     def __init__(self, directory: str):
-        self.todo_list = TodoList(directory)
-        self.keymap = self.load_keymap()
-        self.current_category_idx = 0
-        self.selected_idx = 0
-        self.footer_text = ""
-        self.init_ui()
+        # Load the todo files in the background while the UI is built
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            load_future = executor.submit(TodoList, directory)
+            self.keymap = self.load_keymap()
+            self.current_category_idx = 0
+            self.selected_idx = 0
+            self.footer_text = ""
+            self.init_ui()
+            self.todo_list = load_future.result()
+        
+        # Initial UI update
+        self.update_category_tabs()
+        self.update_todo_list()
     
     def load_keymap(self) -> Dict[str, str]:
         """Load custom keymap from config file or use default."""
+        global _KEYMAP_CACHE
         if os.path.exists(CONFIG_FILE):
             try:
+                # Reuse the parsed keymap while the config file is unchanged
+                mtime = os.stat(CONFIG_FILE).st_mtime_ns
+                if _KEYMAP_CACHE is not None and _KEYMAP_CACHE[0] == mtime:
+                    return _KEYMAP_CACHE[1]
+                
                 with open(CONFIG_FILE, 'r') as f:
                     custom_keymap = json.load(f)
-                    # Merge with defaults for any missing keys
-                    return {**DEFAULT_KEYMAP, **custom_keymap}
+                # Merge with defaults for any missing keys
+                keymap = {**DEFAULT_KEYMAP, **custom_keymap}
+                _KEYMAP_CACHE = (mtime, keymap)
+                return keymap
             except Exception as e:
                 self.footer_text = f"Error loading keymap: {e}"
         
@@ -216,10 +329,15 @@ class TodoApp:
         # Todo list
         self.todo_walker = urwid.SimpleFocusListWalker([])
         self.todo_listbox = urwid.ListBox(self.todo_walker)
+        # Row widgets of the current category and their unselected styles
+        self._row_widgets = []
+        self._row_styles = []
         
-        # Category tabs
+        # Category tabs, plus the markup they were last rendered from
         self.category_tabs = urwid.Text('')
-        self.update_category_tabs()
+        self._tab_categories = None
+        self._tab_fragments = []
+        self._tab_selected = None
         
         # Main layout
         self.layout = urwid.Frame(
@@ -228,35 +346,64 @@ class TodoApp:
             footer=self.footer
         )
         
+        # Map keys to their handlers. Built in reverse so that, as with the
+        # old if/elif chain, the first action bound to a key wins.
+        actions = [
+            ('quit', self._on_quit),
+            ('save', self._on_save),
+            ('reload', self._on_reload),
+            ('add', self._on_add),
+            ('category_prev', self._on_category_prev),
+            ('category_next', self._on_category_next),
+            ('move_up', self._on_move_up),
+            ('move_down', self._on_move_down),
+            ('toggle', self._on_toggle),
+            ('delete', self._on_delete),
+            ('edit', self._on_edit),
+            ('help', self._on_help),
+        ]
+        self._dispatch = {self.keymap[action]: handler for action, handler in reversed(actions)}
+        
         # Main loop
         self.loop = urwid.MainLoop(
             self.layout,
             self.palette,
             unhandled_input=self.handle_input
         )
-        
-        # Initial UI update
-        self.update_todo_list()
     
-    def update_category_tabs(self):
+    def update_category_tabs(self, categories: Optional[List[str]] = None):
         """Update the category tabs display."""
-        categories = self.todo_list.get_categories()
+        if categories is None:
+            categories = self.todo_list.get_categories()
         if self.current_category_idx >= len(categories):
             self.current_category_idx = 0
         
-        tabs = []
-        for i, category in enumerate(categories):
-            if i == self.current_category_idx:
-                tabs.append(('selected_category', f" {category} "))
-            else:
-                tabs.append(('category', f" {category} "))
+        # Rebuild the tabs only when the category list itself changed
+        tabs = self._tab_fragments
+        if categories is not self._tab_categories:
+            tabs = [('category', f" {category} ") for category in categories]
+            self._tab_fragments = tabs
+            self._tab_categories = categories
+            self._tab_selected = None
+        elif self.current_category_idx == self._tab_selected:
+            return
+        
+        # Otherwise only restyle the previously and newly selected tabs
+        if self._tab_selected is not None:
+            tabs[self._tab_selected] = ('category', f" {categories[self._tab_selected]} ")
+        if categories:
+            idx = self.current_category_idx
+            tabs[idx] = ('selected_category', f" {categories[idx]} ")
+            self._tab_selected = idx
         
         self.category_tabs.set_text(tabs)
     
-    def update_todo_list(self):
+    def update_todo_list(self, categories: Optional[List[str]] = None):
         """Update the todo list display based on the current category."""
-        categories = self.todo_list.get_categories()
+        if categories is None:
+            categories = self.todo_list.get_categories()
         if not categories:
+            self._row_widgets = self._row_styles = []
             self.todo_walker[:] = [urwid.Text("No categories found")]
             return
         
@@ -267,7 +414,8 @@ class TodoApp:
         if self.selected_idx >= len(todos):
             self.selected_idx = max(0, len(todos) - 1)
         
-        widgets = []
+        widgets = [None] * len(todos)
+        styles = [None] * len(todos)
         for i, todo in enumerate(todos):
             text = todo.text
             if todo.done:
@@ -278,100 +426,114 @@ class TodoApp:
                 style = 'todo'
             
             text_widget = urwid.Text([('', f" {checkbox} "), (style, text)])
+            styles[i] = style
             if i == self.selected_idx:
-                widgets.append(urwid.AttrMap(text_widget, 'selected'))
+                widgets[i] = urwid.AttrMap(text_widget, 'selected')
             else:
-                widgets.append(urwid.AttrMap(text_widget, style))
+                widgets[i] = urwid.AttrMap(text_widget, style)
+        
+        self._row_widgets = widgets
+        self._row_styles = styles
         
         if not widgets:
             widgets = [urwid.Text(f"No todos in category '{current_category}'. Press '{self.keymap['add']}' to add one.")]
         
         self.todo_walker[:] = widgets
     
+    def select_todo(self, idx: int):
+        """Move the selection to another todo, restyling only the two affected rows."""
+        rows = self._row_widgets
+        old_idx = self.selected_idx
+        self.selected_idx = idx
+        if not (0 <= old_idx < len(rows) and 0 <= idx < len(rows)):
+            self.update_todo_list()
+            return
+        
+        rows[old_idx].set_attr_map({None: self._row_styles[old_idx]})
+        rows[idx].set_attr_map({None: 'selected'})
+    
     def handle_input(self, key):
         """Handle keyboard input based on the keymap."""
         # Convert key to string if it's not already
         if isinstance(key, tuple):
             return
         
-        key = str(key)
+        handler = self._dispatch.get(str(key))
+        if handler is None:
+            return
         
-        # Handle input based on keymap
-        if key == self.keymap['quit']:
-            raise urwid.ExitMainLoop()
-            
-        elif key == self.keymap['save']:
-            self.todo_list.save_todos()
-            self.set_footer_text("Todos saved successfully!")
-            
-        elif key == self.keymap['reload']:
-            self.todo_list.load_todos()
-            self.update_category_tabs()
-            self.update_todo_list()
-            self.set_footer_text("Reloaded todos from files")
-            
-        elif key == self.keymap['add']:
-            self.show_add_dialog()
-            
-        elif key == self.keymap['category_prev']:
-            categories = self.todo_list.get_categories()
-            if categories:
-                self.current_category_idx = (self.current_category_idx - 1) % len(categories)
-                self.selected_idx = 0
-                self.update_category_tabs()
-                self.update_todo_list()
-                
-        elif key == self.keymap['category_next']:
-            categories = self.todo_list.get_categories()
-            if categories:
-                self.current_category_idx = (self.current_category_idx + 1) % len(categories)
-                self.selected_idx = 0
-                self.update_category_tabs()
-                self.update_todo_list()
-                
-        elif key == self.keymap['move_up']:
-            if self.selected_idx > 0:
-                self.selected_idx -= 1
-                self.update_todo_list()
-                
-        elif key == self.keymap['move_down']:
-            categories = self.todo_list.get_categories()
-            if categories:
-                current_category = categories[self.current_category_idx]
-                todos = self.todo_list.get_todos_by_category(current_category)
-                if self.selected_idx < len(todos) - 1:
-                    self.selected_idx += 1
-                    self.update_todo_list()
-                    
-        elif key == self.keymap['toggle']:
-            categories = self.todo_list.get_categories()
-            if categories:
-                current_category = categories[self.current_category_idx]
-                todos = self.todo_list.get_todos_by_category(current_category)
-                if todos and 0 <= self.selected_idx < len(todos):
-                    todos[self.selected_idx].toggle()
-                    self.update_todo_list()
-                    self.set_footer_text(f"Toggled: {todos[self.selected_idx].text}")
-                    
-        elif key == self.keymap['delete']:
-            categories = self.todo_list.get_categories()
-            if categories:
-                current_category = categories[self.current_category_idx]
-                todos = self.todo_list.get_todos_by_category(current_category)
-                if todos and 0 <= self.selected_idx < len(todos):
-                    todo = todos[self.selected_idx]
-                    self.show_delete_dialog(todo)
-                    
-        elif key == self.keymap['edit']:
-            categories = self.todo_list.get_categories()
-            if categories:
-                current_category = categories[self.current_category_idx]
-                todos = self.todo_list.get_todos_by_category(current_category)
-                if todos and 0 <= self.selected_idx < len(todos):
-                    self.show_edit_dialog(todos[self.selected_idx])
-                    
-        elif key == self.keymap['help']:
-            self.show_help_dialog()
+        # Look up the current category and its todos once for every handler
+        categories = self.todo_list.get_categories()
+        current_category = categories[self.current_category_idx] if categories else None
+        todos = self.todo_list.get_todos_by_category(current_category) if current_category else []
+        handler(categories, current_category, todos)
+    
+    def _on_quit(self, categories, current_category, todos):
+        """Quit the application."""
+        raise urwid.ExitMainLoop()
+    
+    def _on_save(self, categories, current_category, todos):
+        """Save todos to their files."""
+        self.todo_list.save_todos()
+        self.set_footer_text("Todos saved successfully!")
+    
+    def _on_reload(self, categories, current_category, todos):
+        """Reload todos from the files."""
+        self.todo_list.load_todos()
+        self.update_category_tabs()
+        self.update_todo_list()
+        self.set_footer_text("Reloaded todos from files")
+    
+    def _on_add(self, categories, current_category, todos):
+        """Open the add dialog."""
+        self.show_add_dialog()
+    
+    def _on_category_prev(self, categories, current_category, todos):
+        """Switch to the previous category."""
+        if categories:
+            self.current_category_idx = (self.current_category_idx - 1) % len(categories)
+            self.selected_idx = 0
+            self.update_category_tabs(categories)
+            self.update_todo_list(categories)
+    
+    def _on_category_next(self, categories, current_category, todos):
+        """Switch to the next category."""
+        if categories:
+            self.current_category_idx = (self.current_category_idx + 1) % len(categories)
+            self.selected_idx = 0
+            self.update_category_tabs(categories)
+            self.update_todo_list(categories)
+    
+    def _on_move_up(self, categories, current_category, todos):
+        """Select the todo above."""
+        if self.selected_idx > 0:
+            self.select_todo(self.selected_idx - 1)
+    
+    def _on_move_down(self, categories, current_category, todos):
+        """Select the todo below."""
+        if self.selected_idx < len(todos) - 1:
+            self.select_todo(self.selected_idx + 1)
+    
+    def _on_toggle(self, categories, current_category, todos):
+        """Toggle the selected todo."""
+        if todos and 0 <= self.selected_idx < len(todos):
+            todos[self.selected_idx].toggle()
+            self.update_todo_list(categories)
+            self.set_footer_text(f"Toggled: {todos[self.selected_idx].text}")
+    
+    def _on_delete(self, categories, current_category, todos):
+        """Ask to delete the selected todo."""
+        if todos and 0 <= self.selected_idx < len(todos):
+            self.show_delete_dialog(todos[self.selected_idx])
+    
+    def _on_edit(self, categories, current_category, todos):
+        """Open the edit dialog for the selected todo."""
+        if todos and 0 <= self.selected_idx < len(todos):
+            self.show_edit_dialog(todos[self.selected_idx])
+    
+    def _on_help(self, categories, current_category, todos):
+        """Show the help dialog."""
+        self.show_help_dialog()
     
     def set_footer_text(self, text):
         """Set footer text with a timeout to clear after a few seconds."""
@@ -499,11 +661,12 @@ class TodoApp:
         )
         
         def on_save(button):
-            old_category = todo.category
-            
             # Update the todo
-            todo.text = text_edit.edit_text.strip()
-            todo.category = category_edit.edit_text.strip() or "uncategorized"
+            self.todo_list.update_todo(
+                todo,
+                text_edit.edit_text.strip(),
+                category_edit.edit_text.strip()
+            )
             
             # Update category and selection
             categories = self.todo_list.get_categories()